@@ -4,8 +4,7 @@ based on `Curve25519 <https://cr.yp.to/ecdh.html>`__ and the
 `Ristretto <https://ristretto.group>`__ group.
 """
 from __future__ import annotations
-from typing import Union, Optional
-import doctest
+from typing import Union, Optional, Sequence, List
 import oblivious
 
 class data(oblivious.ristretto.point):
@@ -23,18 +22,41 @@ class data(oblivious.ristretto.point):
         '5a5dbd5c765abf60b2076133482c1ada189c319034ae0b933f4908b3b68d0225'
         >>> data.hash(bytes([123])).hex()
         'be6f2de25b6907d7e07e6a75424c6f4bbed103c2957b9fa9fbe4fd63dfa5575b'
+        >>> data.hash(bytearray([123])).hex()
+        'be6f2de25b6907d7e07e6a75424c6f4bbed103c2957b9fa9fbe4fd63dfa5575b'
         >>> data.hash([1, 2, 3])
         Traceback (most recent call last):
           ...
         TypeError: can only hash a string or bytes-like object to a data object
         """
-        if not isinstance(argument, (bytes, bytearray, str)):
-            raise TypeError(
-                'can only hash a string or bytes-like object to a data object'
-            )
+        # Plain bytes and str arguments are the common cases.
+        argument_type = type(argument)
+        if argument_type is not bytes:
+            if argument_type is str or isinstance(argument, str):
+                argument = argument.encode()
+            elif not isinstance(argument, (bytes, bytearray)):
+                raise TypeError(
+                    'can only hash a string or bytes-like object to a data object'
+                )
+
+        return super().hash(argument)
 
-        argument = argument.encode() if isinstance(argument, str) else argument
-        return bytes.__new__(cls, oblivious.ristretto.point.hash(argument))
+    @classmethod
+    def hash_many(cls, arguments: Sequence[Union[str, bytes]]) -> List[data]:
+        """
+        Return a list of data objects constructed by hashing each of the
+        supplied strings or bytes-like objects (in the same order).
+
+        >>> ds = data.hash_many(['abc', bytes([123])])
+        >>> ds == [data.hash('abc'), data.hash(bytes([123]))]
+        True
+        >>> data.hash_many(['abc', [1, 2, 3]])
+        Traceback (most recent call last):
+          ...
+        TypeError: can only hash a string or bytes-like object to a data object
+        """
+        hash_ = cls.hash
+        return [hash_(argument) for argument in arguments]
 
     @classmethod
     def from_base64(cls, s: str) -> data:
@@ -46,20 +68,26 @@ class data(oblivious.ristretto.point):
         >>> data.from_base64(d.to_base64()) == d
         True
         """
-        return bytes.__new__(cls, oblivious.ristretto.point.from_base64(s))
+        return super().from_base64(s)
 
     def __new__(cls, bs: Optional[bytes] = None) -> data:
         """
         Return data object corresponding to the supplied bytes-like object. No
         checks are performed to confirm that the bytes-like object is a valid
-        representation of a data object.
+        representation of a data object. A data object that is supplied is
+        returned as is (because instances are immutable, no copy is needed).
 
         >>> d = data.hash('abc')
         >>> bs = bytes(d)
         >>> data(bs) == d
         True
+        >>> data(d) is d
+        True
         """
-        return bytes.__new__(cls, oblivious.ristretto.point(bs))
+        if type(bs) is cls: # pylint: disable=unidiomatic-typecheck
+            return bs
+
+        return bytes.__new__(cls, bs) if bs is not None else cls.random()
 
     def __truediv__(self: data, argument: mask) -> data:
         """
@@ -70,6 +98,8 @@ class data(oblivious.ristretto.point):
         >>> m = mask.hash('abc')
         >>> ((m(d)) / m) == d
         True
+        >>> type(m(d) / m) is data
+        True
         """
         return data((~argument) * self)
 
@@ -81,7 +111,7 @@ class data(oblivious.ristretto.point):
         >>> d.to_base64()
         'Wl29XHZav2CyB2EzSCwa2hicMZA0rguTP0kIs7aNAiU='
         """
-        return oblivious.ristretto.point(self).to_base64()
+        return super().to_base64()
 
 class mask(oblivious.ristretto.scalar):
     """
@@ -96,7 +126,7 @@ class mask(oblivious.ristretto.scalar):
         >>> len(m) == 32 and oblivious.ristretto.scalar(m) == m
         True
         """
-        return bytes.__new__(cls, oblivious.ristretto.scalar())
+        return super().random()
 
     @classmethod
     def hash(cls, argument: Union[str, bytes]) -> mask: # pylint: disable=arguments-renamed
@@ -108,18 +138,23 @@ class mask(oblivious.ristretto.scalar):
         'ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f200150d'
         >>> mask.hash(bytes([123])).hex()
         '904ea0ec29650f3b2bcf481e3ea2553488030c865aae2decba8ce7016c4e380c'
+        >>> mask.hash(bytearray([123])).hex()
+        '904ea0ec29650f3b2bcf481e3ea2553488030c865aae2decba8ce7016c4e380c'
         >>> mask.hash([1, 2, 3])
         Traceback (most recent call last):
           ...
         TypeError: can only hash a string or bytes-like object to a mask object
         """
-        if not isinstance(argument, (bytes, bytearray, str)):
-            raise TypeError(
-                'can only hash a string or bytes-like object to a mask object'
-            )
+        argument_type = type(argument)
+        if argument_type is not bytes:
+            if argument_type is str or isinstance(argument, str):
+                argument = argument.encode()
+            elif not isinstance(argument, (bytes, bytearray)):
+                raise TypeError(
+                    'can only hash a string or bytes-like object to a mask object'
+                )
 
-        argument = argument.encode() if isinstance(argument, str) else argument
-        return bytes.__new__(cls, oblivious.ristretto.scalar.hash(argument))
+        return super().hash(argument)
 
     @classmethod
     def from_base64(cls, s: str) -> mask:
@@ -131,20 +166,47 @@ class mask(oblivious.ristretto.scalar):
         >>> mask.from_base64(m.to_base64()) == m
         True
         """
-        return bytes.__new__(cls, oblivious.ristretto.scalar.from_base64(s))
+        return super().from_base64(s)
+
+    @classmethod
+    def combine(cls, a: mask, b: mask) -> mask:
+        """
+        Return the mask object that is equivalent to applying the two supplied
+        masks in succession. Only a scalar multiplication (rather than a point
+        multiplication) is performed.
+
+        >>> d = data.hash('abc')
+        >>> (a, b) = (mask.hash('abc'), mask.hash('def'))
+        >>> mask.combine(a, b)(d) == a(b(d))
+        True
+        >>> mask.combine(a, d)
+        Traceback (most recent call last):
+          ...
+        TypeError: can only combine two mask objects
+        """
+        if not isinstance(a, mask) or not isinstance(b, mask):
+            raise TypeError('can only combine two mask objects')
+
+        return cls(oblivious.ristretto.scalar.__mul__(a, b))
 
     def __new__(cls, bs: Optional[bytes] = None) -> mask:
         """
         Return mask object corresponding to the supplied bytes-like object. No
         checks are performed to confirm that the bytes-like object is a valid
-        representation of a mask object.
+        representation of a mask object. A mask object that is supplied is
+        returned as is (because instances are immutable, no copy is needed).
 
         >>> m = mask()
         >>> bs = bytes(m)
         >>> mask(bs) == m
         True
+        >>> mask(m) is m
+        True
         """
-        return bytes.__new__(cls, oblivious.ristretto.scalar(bs))
+        if type(bs) is cls: # pylint: disable=unidiomatic-typecheck
+            return bs
+
+        return bytes.__new__(cls, bs) if bs is not None else cls.random()
 
     def __invert__(self: mask) -> mask:
         """
@@ -158,8 +220,31 @@ class mask(oblivious.ristretto.scalar):
         True
         >>> m((~m)(d)) == d
         True
+
+        The inverse is computed only once and is then retained by this instance.
+
+        >>> ~m is ~m
+        True
+        """
+        inverse = getattr(self, '_inverse', None)
+        if inverse is None:
+            inverse = mask(super().__invert__())
+            self._inverse = inverse # pylint: disable=attribute-defined-outside-init
+        return inverse
+
+    def __reduce__(self: mask) -> tuple:
+        """
+        Return the state used when pickling or copying this mask instance. Only
+        the bytes of the mask are included (and not its retained inverse).
+
+        >>> import pickle
+        >>> m = mask.hash('abc')
+        >>> m_inv = ~m
+        >>> n = pickle.loads(pickle.dumps(m))
+        >>> (n == m, type(n) is mask, '_inverse' in n.__dict__)
+        (True, True, False)
         """
-        return mask(~oblivious.ristretto.scalar(self))
+        return (type(self), (bytes(self),))
 
     def mask(self: mask, argument: data) -> data:
         """
@@ -171,7 +256,22 @@ class mask(oblivious.ristretto.scalar):
         >>> m.mask(d).hex()
         'f47c8267b28ac5100e0e97b36190e16d4533b367262557a5aa7d97b811344d15'
         """
-        return data(oblivious.ristretto.scalar(self) * argument)
+        return data(super().__mul__(argument))
+
+    def mask_many(self: mask, arguments: Sequence[data]) -> List[data]:
+        """
+        Mask each :obj:`data` object in the supplied sequence with this mask
+        and return a list of the masked data objects (in the same order).
+
+        >>> ds = [data.hash('abc'), data.hash('def')]
+        >>> m = mask.hash('abc')
+        >>> m.mask_many(ds) == [m(d) for d in ds]
+        True
+        >>> m.mask_many([])
+        []
+        """
+        multiply = super().__mul__
+        return [data(multiply(argument)) for argument in arguments]
 
     def __call__(self: mask, argument: data) -> data:
         """
@@ -183,7 +283,7 @@ class mask(oblivious.ristretto.scalar):
         >>> m(d).hex()
         'f47c8267b28ac5100e0e97b36190e16d4533b367262557a5aa7d97b811344d15'
         """
-        return data(oblivious.ristretto.scalar(self) * argument)
+        return data(super().__mul__(argument))
 
     def __mul__(self: mask, argument: data) -> data:
         """
@@ -195,7 +295,7 @@ class mask(oblivious.ristretto.scalar):
         >>> (m * d).hex()
         'f47c8267b28ac5100e0e97b36190e16d4533b367262557a5aa7d97b811344d15'
         """
-        return data(oblivious.ristretto.scalar(self) * argument)
+        return data(super().__mul__(argument))
 
     def unmask(self: mask, argument: data) -> data:
         """
@@ -207,7 +307,38 @@ class mask(oblivious.ristretto.scalar):
         >>> m.unmask(m(d)) == d
         True
         """
-        return data(oblivious.ristretto.scalar(~self) * argument)
+        return (~self) * argument
+
+    def unmask_many(self: mask, arguments: Sequence[data]) -> List[data]:
+        """
+        Unmask each :obj:`data` object in the supplied sequence (each of which
+        has previously been masked with this mask) and return a list of the
+        original :obj:`data` objects (in the same order). The inverse of this
+        mask is computed only once for the entire sequence.
+
+        >>> ds = [data.hash('abc'), data.hash('def')]
+        >>> m = mask.hash('abc')
+        >>> m.unmask_many(m.mask_many(ds)) == ds
+        True
+        >>> m.unmask_many([])
+        []
+        """
+        return (~self).mask_many(arguments)
+
+    def rotate(self: mask, old: mask, arguments: Sequence[data]) -> List[data]:
+        """
+        Replace the supplied mask with this mask on each :obj:`data` object in
+        the supplied sequence (each of which has previously been masked with the
+        supplied mask) and return a list of the re-masked :obj:`data` objects
+        (in the same order). The two masks are combined before they are applied,
+        so only one point multiplication is performed for each data object.
+
+        >>> ds = [data.hash('abc'), data.hash('def')]
+        >>> (old, new) = (mask.hash('abc'), mask.hash('def'))
+        >>> new.rotate(old, old.mask_many(ds)) == new.mask_many(ds)
+        True
+        """
+        return self.combine(self, ~old).mask_many(arguments)
 
     def to_base64(self: mask) -> str:
         """
@@ -217,7 +348,8 @@ class mask(oblivious.ristretto.scalar):
         >>> m.to_base64()
         'ungWv48Bz+pBQUDeXa4iI7ADYaOWF3qctBD/YfIAFQ0='
         """
-        return oblivious.ristretto.scalar(self).to_base64()
+        return super().to_base64()
 
 if __name__ == '__main__':
+    import doctest # pragma: no cover
     doctest.testmod() # pragma: no cover